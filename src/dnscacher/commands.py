@@ -1,9 +1,10 @@
 import logging
 import sys
-from typing import Callable
+from typing import Callable, TextIO
 
 from dnscacher import exceptions, formatter, logger
 from dnscacher.domains import Domains
+from dnscacher.enums import Command, Output
 from dnscacher.ipset import IpSet
 from dnscacher.mappings import Mappings
 from dnscacher.parser import Parser
@@ -22,7 +23,7 @@ def main():
 
     settings.makedirs()
 
-    print(Commands.run(settings))
+    Commands.run(settings, sys.stdout)
 
 
 class Commands:
@@ -36,37 +37,40 @@ class Commands:
         self._settings = settings
 
     @classmethod
-    def run(cls, settings: Settings) -> str:
+    def run(cls, settings: Settings, file: TextIO):
         """Run the command specified in the settings.
 
         Args:
             settings: The settings object.
-
-        Returns:
-            The output of the command.
+            file: The file to write the output of the command to.
         """
-        return cls(settings)()
+        cls(settings)(file)
 
-    def __call__(self) -> str:
+    def __call__(self, file: TextIO):
         """Run the command specified in the settings.
 
-        Returns:
-            The output of the command.
+        Only the objects of the requested outputs are built, each at most
+        once, as one object can serve several outputs.
+
+        Args:
+            file: The file to write the output of the command to.
         """
-        callback: Callable[[], None] = getattr(self, self._settings.command)
-        callback()
+        self._COMMANDS[self._settings.command](self)
+
+        outputs: set[Output] = {Output(x) for x in self._settings.output}
+        builds = dict.fromkeys(
+            build
+            for output, build in self._OUTPUTS.items()
+            if output in outputs
+        )
+        objects: list[object] = [build(self) for build in builds]
+        formatter.write(objects, self._settings.output, file)
 
+    def _ipset(self) -> IpSet:
+        """Return the ipset that contains the IPs of the mappings."""
         ipset: IpSet = IpSet(self._settings.ipset)
         ipset.update(self._mappings.ips)
-        return formatter.product(
-            [
-                self._mappings,
-                self._mappings.ips,
-                self._mappings.domains,
-                ipset,
-            ],
-            self._settings.output,
-        )
+        return ipset
 
     def get(self):
         """Retrieve the mappings from cache.
@@ -92,7 +96,7 @@ class Commands:
         self._mappings.load()
 
         self._domains.update_from_source(self._settings.source)
-        new: Domains = self._domains - self._mappings.domains
+        new: set[str] = self._domains - self._mappings.keys()
         logging.info("Number of new domains: %d", len(new))
 
         self._mappings.update_by_resolving(
@@ -101,11 +105,12 @@ class Commands:
 
     def _remove(self):
         """Remove domains that are not in the source."""
-        remove: Domains = self._mappings.domains - self._domains
+        remove: set[str] = self._mappings.keys() - self._domains
         logging.info("Number of removed domains: %d", len(remove))
-        for domain in remove:
-            self._mappings.pop(domain)
-            logging.debug("Removing domain: %s", domain)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            for domain in remove:
+                logging.debug("Removing domain: %s", domain)
+        self._mappings.remove_many(remove)
 
     def add(self):
         """Resolve and add the domains from the Settings.source that are not yet
@@ -134,3 +139,18 @@ class Commands:
             self._settings.timeout,
         )
         self._mappings.save()
+
+    _COMMANDS: dict[str, Callable[["Commands"], None]] = {
+        Command.GET: get,
+        Command.ADD: add,
+        Command.UPDATE: update,
+        Command.REFRESH: refresh,
+    }
+
+    _OUTPUTS: dict[Output, Callable[["Commands"], object]] = {
+        Output.MAPPING: lambda self: self._mappings,
+        Output.IP: lambda self: self._mappings.ips,
+        Output.DOMAIN: lambda self: self._mappings.domains,
+        Output.IPSET: _ipset,
+        Output.IPSET_RESTORE: _ipset,
+    }
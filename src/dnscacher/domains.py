@@ -1,32 +1,63 @@
+import codecs
 import random
 import re
-from collections.abc import Set
+import sys
+from collections.abc import Iterable, Iterator
+from functools import partial
+from itertools import islice
+from math import expm1, floor, log
 from os.path import isfile
 from typing import Self, override
 
-import requests
+import urllib3
 
 from dnscacher.enums import Output
+from dnscacher.exceptions import SourceError
+
+_CHUNK_SIZE: int = 1 << 16
+
+# Connection errors, such as a host that does not resolve, are not retried.
+_HTTP: urllib3.PoolManager = urllib3.PoolManager(
+    retries=urllib3.Retry(3, connect=0, backoff_factor=0.3)
+)
+
+_URL_SCHEMES: tuple[str, ...] = ("http://", "https://")
+
+_DOMAIN_PATTERN: re.Pattern[str] = re.compile(
+    r"(?im)^[^\S\n]*#.*"
+    r"|\b((?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,})\b"
+)
 
 
 class Domains(set[str]):
-    """A set subclass for handling domains with additional operations."""
+    """A set subclass for handling domains with additional operations.
+
+    The set operators are inherited from `set` and return a plain `set`, so
+    the result is not copied into a new Domains object.
+    """
 
     def update_from_source(self, source: str) -> Self:
         """Update the set of domains that is downloaded from a URL or retrieved
         from a file.
 
         Args:
-            url (str): URL to download the blocklist from.
+            source (str): File path or http(s) URL of the blocklist.
 
         Returns:
             Domains: The updated set of domains.
 
+        Raises:
+            SourceError: If the source is neither a file nor an http(s) URL.
+
         """
         if isfile(source):
             self.update_from_file(source)
-        else:
+        elif source.lower().startswith(_URL_SCHEMES):
             self.update_from_url(source)
+        else:
+            raise SourceError(
+                f"Source is neither a file nor an http(s) URL: {source}"
+            )
         return self
 
     def update_from_file(self, path: str) -> Self:
@@ -40,15 +71,40 @@ class Domains(set[str]):
 
         """
         with open(path) as file:
-            self.update_from_str(file.read())
+            self.update_from_chunks(iter(partial(file.read, _CHUNK_SIZE), ""))
+        return self
+
+    def update_from_chunks(self, chunks: Iterable[str]) -> Self:
+        """Update the set of domains from text that is received in chunks.
+
+        Only complete lines are parsed. The trailing partial line of a chunk is
+        prepended to the next chunk.
+
+        Args:
+            chunks: Iterable of text chunks.
+
+        Returns:
+            the updated set of domains.
+
+        """
+        tail: str = ""
+        for chunk in chunks:
+            lines, _, tail = (tail + chunk).rpartition("\n")
+            self.update_from_str(lines)
+        self.update_from_str(tail)
         return self
 
     def update_from_str(self, text: str):
         """Parse text into a set of domains.
 
-        For each line, the function extracts domains using a regular expression.
-        This approach supports typical `/etc/hosts` file entries as well as
-        URLs.
+        The whole text is scanned at once using a regular expression. This
+        approach supports typical `/etc/hosts` file entries as well as URLs.
+        Lines that start with a `#` are matched as a whole by the first
+        alternative of the pattern, which yields an empty string that is
+        discarded.
+
+        The domains are interned, so they share their string object with the
+        same domains in the mappings that are loaded from cache.
 
         Args:
             text (str): Text to parse.
@@ -56,36 +112,48 @@ class Domains(set[str]):
         Returns:
             set[str]: Set of domains.
         """
-        domain_pattern: re.Pattern[str] = re.compile(
-            r"(?i)\b(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+(?:[a-z]{2,})\b"
-        )
-
-        for line in text.splitlines():
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            matches = domain_pattern.findall(line)
-            for match in matches:
-                if isinstance(match, str):
-                    self.add(match.lower())
+        matches: list[str] = _DOMAIN_PATTERN.findall(text)
+        self.update(map(sys.intern, map(str.lower, filter(None, matches))))
 
     def update_from_url(self, url: str) -> Self:
         """Update the set of domains that is downloaded from a URL.
 
+        The response is requested gzip compressed and is parsed while it is
+        streamed. Connection errors are not retried, as the CLI is run once.
+
         Args:
             url: URL to download the blocklist from.
 
         Returns:
             the updated set of domains.
+
+        Raises:
+            SourceError: If the blocklist cannot be downloaded.
         """
-        response: requests.Response = requests.get(url)
-        response.raise_for_status()
-        self.update_from_str(response.text)
+        try:
+            response = _HTTP.request(
+                "GET",
+                url,
+                preload_content=False,
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
+            with response:
+                if response.status >= 400:
+                    raise SourceError(
+                        f"Error downloading {url}: HTTP {response.status}"
+                    )
+                self.update_from_chunks(_decode(response.stream(_CHUNK_SIZE)))
+        except urllib3.exceptions.HTTPError as e:
+            raise SourceError(f"Error downloading {url}") from e
         return self
 
     def make_random_subset(self, part: int) -> Self:
         """Return a random subset of the domains based on a percentage.
 
+        The subset is drawn with reservoir sampling (Algorithm L), so the set is
+        not copied into a list first. Only the reservoir of `n` domains is
+        allocated and the domains that are skipped are consumed by `islice`.
+
         Args:
             part (int): Percentage (0-100) of domains to include in the subset.
 
@@ -95,22 +163,21 @@ class Domains(set[str]):
         """
         n: int = len(self) * part // 100
         cls: type[Self] = type(self)
-        return cls(random.sample(list(self), n))
-
-    @override
-    def __sub__(self, other: Set[str | None]) -> Self:
-        """Return the difference between two Domains sets."""
-        return type(self)(super().__sub__(other))
-
-    @override
-    def __and__(self, other: Set[object]) -> Self:
-        """Return the intersection of two Domains sets."""
-        return type(self)(super().__and__(other))
-
-    @override
-    def __or__(self, other: Set[str]) -> Self:
-        """Return the union of two Domains sets."""
-        return type(self)(super().__or__(other))
+        if n == 0:
+            return cls()
+        elif n >= len(self):
+            return cls(self)
+
+        iterator = iter(self)
+        reservoir: list[str] = list(islice(iterator, n))
+        log_w: float = log(_uniform()) / n
+        while True:
+            skip: int = floor(log(_uniform()) / log(-expm1(log_w)))
+            domain: str | None = next(islice(iterator, skip, None), None)
+            if domain is None:
+                return cls(reservoir)
+            reservoir[random.randrange(n)] = domain
+            log_w += log(_uniform()) / n
 
     @override
     def __repr__(self) -> str:
@@ -133,4 +200,31 @@ class Domains(set[str]):
             str: Formatted string representation.
 
         """
-        return str(self) if Output(format_spec) == Output.DOMAIN else ""
+        return str(self) if format_spec == Output.DOMAIN else ""
+
+
+def _decode(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode UTF-8 chunks, of which a character may span two chunks.
+
+    The decoder is flushed at the end, so a truncated character at the end of
+    the stream is replaced instead of dropped.
+
+    Args:
+        chunks: Iterable of UTF-8 encoded chunks.
+
+    Yields:
+        The decoded chunks.
+
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def _uniform() -> float:
+    """Return a random float in the open interval (0, 1)."""
+    value: float = 0.0
+    while value == 0.0:
+        value = random.random()
+    return value
@@ -1,7 +1,7 @@
-from enum import Enum
+from enum import StrEnum
 
 
-class Command(Enum):
+class Command(StrEnum):
     """Command: Command to execute."""
 
     ADD = "add"
@@ -10,11 +10,12 @@ class Command(Enum):
     REFRESH = "refresh"
 
 
-class Output(Enum):
+class Output(StrEnum):
     IP = "ips"
     DOMAIN = "domains"
     MAPPING = "mappings"
     IPSET = "ipset"
+    IPSET_RESTORE = "ipset-restore"
 
     @classmethod
     def multiple(cls, values: str | list[str]) -> tuple["Output", ...]:
@@ -12,8 +12,8 @@ class IpSetError(Exception):
     """Raised when an error occurs during ipset operations."""
 
 
-class SettingsError(Exception):
-    """Raised when a setting is missing or invalid."""
+class SourceError(Exception):
+    """Raised when the domains cannot be retrieved from the source."""
 
 
 def hook(
@@ -36,7 +36,7 @@ def hook(
         InvalidCacheError,
         ArgumentError,
         IpSetError,
-        SettingsError,
+        SourceError,
     )
     if isinstance(value, expected):
         logging.error(value)
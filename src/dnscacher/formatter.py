@@ -1,21 +1,23 @@
 from collections.abc import Iterable
+from typing import TextIO
 
 
-def product(objects: list[object], format_specs: Iterable[str]) -> str:
-    """Return a list of formatted strings, concatenated by a newline character.
+def write(objects: list[object], format_specs: Iterable[str], file: TextIO):
+    """Write the formatted objects to a file, each followed by a newline
+    character.
+
+    The formatted objects are not concatenated into one string first, and
+    objects that format to an empty string are skipped.
 
     Args:
         objects (list[object]): List of objects.
         format_specs (list[str]): List of format specifications.
-
-    Returns:
-        formatted string
+        file (TextIO): File to write to.
 
     """
-    result: str = ""
     for spec in format_specs:
         for obj in objects:
-            result += format(obj, spec)
-            result += "\n" if not result.endswith("\n") else ""
-
-    return result.strip()
+            text: str = format(obj, spec)
+            if text:
+                file.write(text)
+                file.write("\n")
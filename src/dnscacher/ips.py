@@ -22,7 +22,7 @@ class Ips(set[str]):
             str: Formatted string representation.
 
         """
-        return str(self) if Output(format_spec) == Output.IP else ""
+        return str(self) if format_spec == Output.IP else ""
 
     @override
     def __repr__(self) -> str:
@@ -24,10 +24,40 @@ class IpSet(set[str]):
 
     @override
     def __format__(self, format_spec: str) -> str:
-        """Return the name of the ipset."""
-        return str(self) if Output(format_spec) == Output.IPSET else ""
+        """Return the `add` lines of the ipset, preceded by its `create` and
+        `flush` lines for the `ipset-restore` output."""
+        if format_spec == Output.IPSET:
+            return str(self)
+        elif format_spec == Output.IPSET_RESTORE:
+            return self.restore()
+        return ""
+
+    def restore(self) -> str:
+        """Return an `ipset restore` script that fills the ipset.
+
+        The script creates the ipset if it does not exist yet, flushes it, and
+        adds each IP. As such, `ipset restore` only has to be run once.
+
+        Returns:
+            The `create`, `flush` and `add` lines of the ipset.
+
+        """
+        lines: list[str] = [
+            f"create {self.name} hash:ip -exist",
+            f"flush {self.name}",
+        ]
+        if self:
+            lines.append(str(self))
+        return "\n".join(lines)
 
     @override
     def __str__(self) -> str:
-        """Return the name of the ipset."""
-        return "\n".join(f"add {self.name} {ip}" for ip in self)
+        """Return an `add` line for each IP of the ipset.
+
+        The `add {name} ` prefix is formatted once and used as part of the
+        separator, so no string is formatted per IP.
+        """
+        if not self:
+            return ""
+        prefix: str = f"add {self.name} "
+        return prefix + f"\n{prefix}".join(self)
@@ -1,6 +1,12 @@
+import atexit
 import logging
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
+from queue import SimpleQueue
 
 _stderr_write = sys.stderr.write
 
@@ -25,20 +31,30 @@ def init():
 def set(logfile: str, level: str):
     """Set the log file and level for the root logger.
 
+    The records are put on a queue and written to the log file by a
+    background thread, so logging does not block the event loop on disk
+    writes. The thread is stopped at exit, after the queue is drained.
+
     Args:
         logfile (str): Path to the log file.
         level (str): Log level to set.
 
     """
     logger = logging.getLogger()
-    level = getattr(logging, level)
     file = RotatingFileHandler(logfile, maxBytes=1 * 1024 * 1024, backupCount=5)
 
     file.setLevel(level)
     file.setFormatter(logger.handlers[0].formatter)
 
+    queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    handler = QueueHandler(queue)
+    handler.setLevel(level)
+    listener = QueueListener(queue, file, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
     logger.setLevel(level)
-    logger.addHandler(file)
+    logger.addHandler(handler)
     logging.info("--- New run ---")
 
 
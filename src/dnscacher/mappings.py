@@ -1,21 +1,26 @@
-import asyncio
 import logging
 import pickle
-from os import makedirs
+import sys
+from collections.abc import Iterable
+from contextlib import suppress
+from os import makedirs, remove, replace
 from os.path import dirname
+from secrets import token_hex
 from typing import override
 
 from dnscacher.domains import Domains
 from dnscacher.enums import Output
 from dnscacher.exceptions import InvalidCacheError
 from dnscacher.ips import Ips
-from dnscacher.resolve import Resolver
 
 
-class Mappings(dict[str, list[str]]):
-    """A dictionary mapping domains to a list of IPs with persistence and
+class Mappings(dict[str, tuple[str, ...]]):
+    """A dictionary mapping domains to a tuple of IPs with persistence and
     resolution.
 
+    The IPs are stored as tuples, which use less memory and are faster to
+    pickle than lists.
+
     Attributes:
         path (str): Path to the pickled mappings file.
 
@@ -23,7 +28,7 @@ class Mappings(dict[str, list[str]]):
 
     path: str
 
-    EXCLUDED_IPS: set[str] = {"0.0.0.0", "127.0.0.1"}
+    EXCLUDED_IPS: frozenset[str] = frozenset({"0.0.0.0", "127.0.0.1"})
 
     def __init__(self, path: str):
         """Initialize the Mappings object.
@@ -49,22 +54,35 @@ class Mappings(dict[str, list[str]]):
     def ips(self) -> Ips:
         """Return a set of all IPs from the mappings.
 
+        The tuples of IPs are added with a single `set.update` call, instead
+        of adding the IPs one by one from a generator.
+
         Returns:
-            set[str]: A set of IP addresses.
+            Ips: A set of IP addresses.
 
         """
-        return Ips(ip for ips in self.values() for ip in ips)
+        ips: Ips = Ips()
+        ips.update(*self.values())
+        return ips
 
     def load(self):
         """Load domain→IP mappings from a pickle file.
 
+        The domains are interned, so they share their string object with the
+        same domains that are parsed from the source. The IPs of caches that
+        were saved as lists are converted to tuples.
+
         Raises:
             InvalidCacheError: If the mappings file is invalid.
 
         """
         try:
             with open(self.path, "rb") as f:
-                self.update(pickle.load(f))
+                mappings: dict[str, tuple[str, ...]] = pickle.load(f)
+            self.update(
+                (sys.intern(domain), tuple(ips))
+                for domain, ips in mappings.items()
+            )
         except FileNotFoundError:
             logging.info("No mappings file found at %s", self.path)
         except pickle.UnpicklingError as e:
@@ -81,27 +99,55 @@ class Mappings(dict[str, list[str]]):
     def save(self):
         """Save the current domain→IP mappings to a pickle file.
 
+        The mappings are written to a temporary file that replaces the
+        mappings file once it is complete, so an interrupted save never leaves
+        a truncated mappings file behind. The temporary file is created like
+        any new file, so its mode follows the umask of the process.
+
         Raises:
             InvalidCacheError: If saving fails.
 
         """
-        makedirs(dirname(self.path), exist_ok=True)
+        directory: str = dirname(self.path)
+        makedirs(directory, exist_ok=True)
         logging.info("Saving %s mappings to %s", len(self), self.path)
+        temp: str = f"{self.path}.{token_hex(8)}.tmp"
+        try:
+            f = open(temp, "xb")
+        except OSError as e:
+            raise InvalidCacheError(
+                f"Error saving mappings file at {self.path}"
+            ) from e
+
         try:
-            with open(self.path, "wb") as f:
-                pickle.dump(dict(self), f)
+            with f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            replace(temp, self.path)
         except Exception as e:
+            with suppress(OSError):
+                remove(temp)
             raise InvalidCacheError(
                 f"Error saving mappings file at {self.path}"
             ) from e
 
+    def remove_many(self, domains: Iterable[str]):
+        """Remove multiple domains from the mappings.
+
+        Args:
+            domains (Iterable[str]): Domains to remove. Each domain must be in
+            the mappings.
+
+        """
+        for domain in domains:
+            del self[domain]
+
     def update_by_resolving(
-        self, domains: Domains, jobs: int = 10000, timeout: int = 5
+        self, domains: set[str], jobs: int = 10000, timeout: int = 5
     ):
         """Update mappings by asynchronously resolving a set of domains.
 
         Args:
-            domains (Domains): Set of domains to resolve.
+            domains (set[str]): Set of domains to resolve.
             jobs (int, optional): Number of concurrent workers. Defaults to
             10000.
             timeout (int, optional): Timeout in seconds for each resolution.
@@ -111,10 +157,33 @@ class Mappings(dict[str, list[str]]):
         if len(domains) == 0:
             return
 
+        # Imported here, so commands that do not resolve domains do not load
+        # asyncio and aiodns at startup.
+        import asyncio
+
+        from dnscacher.resolve import Resolver, loop_factory
+
         resolver = Resolver(
             jobs=jobs, timeout=timeout, excluded=self.EXCLUDED_IPS
         )
-        asyncio.run(resolver.fetch_ips(domains=domains, mappings=self))
+        asyncio.run(
+            resolver.fetch_ips(domains=domains, mappings=self),
+            loop_factory=loop_factory(),
+        )
+
+    @override
+    def __reduce__(self) -> tuple:
+        """Pickle the Mappings object as a plain dict.
+
+        The items are pickled directly from this object, so the mappings do
+        not have to be copied into a dict first, and the cache does not depend
+        on the Mappings class.
+
+        Returns:
+            tuple: The reduce value of an empty dict and the items to set.
+
+        """
+        return dict, (), None, None, iter(self.items())
 
     @override
     def __format__(self, format_spec: str) -> str:
@@ -128,7 +197,7 @@ class Mappings(dict[str, list[str]]):
             str: A formatted string representation of the Mappings object.
 
         """
-        return str(self) if Output(format_spec) == Output.MAPPING else ""
+        return str(self) if format_spec == Output.MAPPING else ""
 
     @override
     def __str__(self) -> str:
@@ -141,5 +210,5 @@ class Mappings(dict[str, list[str]]):
 
         """
         return "\n".join(
-            f"{domain} {' '.join(ips)}" for domain, ips in self.items()
+            [f"{domain} {' '.join(ips)}" for domain, ips in self.items()]
         )
@@ -1,15 +1,15 @@
-import sys
 from argparse import (
-    Action,
+    SUPPRESS,
     ArgumentError,
     ArgumentParser,
+    ArgumentTypeError,
+    Namespace,
     RawDescriptionHelpFormatter,
 )
 from os.path import join
-from typing import override
 
 from dnscacher import paths
-from dnscacher.enums import Command
+from dnscacher.enums import Command, Output
 from dnscacher.settings import Settings
 
 _DESCRIPTION = """
@@ -54,11 +54,16 @@ class Parser:
         a second (hidden) parser, we can parse the options and positional
         arguments separately (and intermixed) and then merge the namespaces of
         the two parsers into one namespace at the end.
+
+        Options that are not given are left out of the namespace, so the
+        Settings object keeps its defaults for them and the second pass does
+        not overwrite the values of the first pass.
         """
         kwargs = dict(
             prog="dnscacher",
             description=_DESCRIPTION,
             formatter_class=RawDescriptionHelpFormatter,
+            argument_default=SUPPRESS,
         )
         self.parser = ArgumentParser(**kwargs)  # pyright: ignore
         self.make_subparsers(self.parser)
@@ -86,10 +91,10 @@ class Parser:
         parser.add_argument(
             "-o",
             "--output",
-            action=_TupleAction,
+            type=_parse_outputs,
             help=(
                 "Write the obtained data to stdout. Separate multiple outputs "
-                "by a comma. Choices: {', '.join(x.value for x in Output)}"
+                f"by a comma. Choices: {', '.join(x.value for x in Output)}"
             ),
         )
         parser.add_argument(
@@ -111,13 +116,13 @@ class Parser:
         parser.add_argument(
             "-t",
             "--timeout",
-            type=int,
+            type=_parse_positive_int,
             help="Timeout for resolving a domain.",
         )
         parser.add_argument(
             "-j",
             "--jobs",
-            type=int,
+            type=_parse_positive_int,
             help="Number of jobs to run in concurrently (default: 10000).",
         )
         parser.add_argument(
@@ -152,6 +157,7 @@ class Parser:
             name=Command.GET.value,
             description=_DESCRIPTION_GET,
             formatter_class=RawDescriptionHelpFormatter,
+            argument_default=SUPPRESS,
             help=(
                 "Only retrieve the current domain-to-ip mappings stored in "
                 "cache."
@@ -161,6 +167,7 @@ class Parser:
             name=Command.ADD.value,
             description=_DESCRIPTION,
             formatter_class=RawDescriptionHelpFormatter,
+            argument_default=SUPPRESS,
             help=(
                 "Resolve and add the domains from the --source that are not yet"
                 "inthe mappings"
@@ -169,7 +176,6 @@ class Parser:
         subparser_add.add_argument(
             "source",
             nargs="?",  # nargs=1 enforced in the parse_args method
-            action=_SourceAction,
             help=(
                 "URL or file path that contains the domains. Will be ignored if"
                 " the `--debug` option is set."
@@ -180,6 +186,7 @@ class Parser:
             name=Command.UPDATE.value,
             description=_DESCRIPTION,
             formatter_class=RawDescriptionHelpFormatter,
+            argument_default=SUPPRESS,
             help=(
                 "Update the mappings by resolving new domains and removing "
                 "domains that are not in the --source."
@@ -188,7 +195,6 @@ class Parser:
         subparser_update.add_argument(
             "source",
             nargs="?",  # nargs=1 enforced in the parse_args method
-            action=_SourceAction,
             help=(
                 "URL or file path that contains the domains. Will be ignored if"
                 " the `--debug` option is set."
@@ -199,6 +205,7 @@ class Parser:
             name=Command.REFRESH.value,
             description=_DESCRIPTION,
             formatter_class=RawDescriptionHelpFormatter,
+            argument_default=SUPPRESS,
             help=(
                 "Refresh the mappings by re-resolving a percentage of the "
                 "stored mappings based on the --part value."
@@ -231,13 +238,13 @@ class Parser:
             int: The validated integer value.
 
         Raises:
-            ArgumentError: If the value is not between 0 and 100.
+            ArgumentError: If the value is not an integer between 0 and 100.
 
         """
-        value = int(value)
-        if not 0 <= value <= 100:
+        value = str(value)
+        if not (value.isdecimal() and int(value) <= 100):
             raise ArgumentError(None, "part must be between 0 and 100")
-        return value
+        return int(value)
 
     def parse_args(self) -> Settings:
         """Parse the arguments and merge the namespaces of the parser and its
@@ -248,12 +255,12 @@ class Parser:
         """
         parsed, remaining = self.parser.parse_known_args()
 
-        if not parsed.command:  # pyright: ignore
+        if not getattr(parsed, "command", None):
             raise ArgumentError(
                 None, "the following arguments are required: command"
             )
 
-        subparser = self.subparsers[Command(parsed.command)]  # pyright: ignore
+        subparser = self.subparsers[parsed.command]  # pyright: ignore
         parsed, remaining = subparser.parse_known_args(
             remaining, namespace=parsed
         )
@@ -263,50 +270,70 @@ class Parser:
                 None, f"unrecognized arguments: {' '.join(remaining)}"
             )
 
+        self._set_source(subparser, parsed)
         return Settings.from_namespace(parsed)
 
+    @staticmethod
+    def _set_source(parser: ArgumentParser, namespace: Namespace):
+        """Check the source argument of the commands that have one.
 
-class _SourceAction(Action):
-    """Check the source argument.
+        - If `--debug` option is set, set the source to `debug.txt`.
+        - If not, and the source is empty, exit with an error.
 
-    - If `--debug` option is set, set the source to `debug.txt`.
-    - If not, and the source is empty, raise an error.
+        This is done once, after the namespaces of the parser and its
+        subparsers are merged, so the `--debug` option is found regardless of
+        where it is placed.
 
-    Raises:
-        ArgumentError: If the source is empty and the `--debug` option is not
-        set.
+        Args:
+            parser: the subparser of the command, used to report the error.
+            namespace: the merged namespace.
+        """
+        if namespace.command not in (Command.ADD, Command.UPDATE):
+            return
+
+        if getattr(namespace, "debug", False):
+            namespace.source = join(paths.root, "debug.txt")
+        elif not getattr(namespace, "source", None):
+            parser.error("the following arguments are required: source")
+
+
+def _parse_outputs(value: str) -> tuple[str, ...]:
+    """Split the comma-separated outputs into a tuple.
 
-    Note that `sys.argv` is used to check if the `--debug` option instead of
-    using the `namespace` object. This is because the parser has multiple
-    namespaces that are combined into one namespace after using the parser and
-    all the subparsers. By using `sys.argv`, we can check if the `--debug`
-    option is set in any of the namespaces.
+    Args:
+        value: the value of the `--output` option.
 
+    Returns:
+        The outputs.
+
+    Raises:
+        ArgumentTypeError: if one of the outputs is not a valid `Output`.
     """
+    outputs: tuple[str, ...] = tuple(value.split(","))
+    invalid: list[str] = [x for x in outputs if x not in _OUTPUTS]
+    if invalid:
+        raise ArgumentTypeError(
+            f"invalid choice: {', '.join(invalid)} "
+            f"(choose from {', '.join(_OUTPUTS)})"
+        )
+    return outputs
 
-    @override
-    def __call__(self, parser, namespace, values, option_string=None):
-        """Set the `namespace.source` attribute.
 
-        Raises:
-            ArgumentError: if the source is empty and the `--debug` option is
-            not set.
-        """
-        if hasattr(namespace, "source") and namespace.source:
-            return
+def _parse_positive_int(value: str) -> int:
+    """Convert the value of an option to an integer greater than zero.
+
+    Args:
+        value: the value of the option.
 
-        if "--debug" in sys.argv:
-            values = join(paths.root, "debug.txt")
-        elif not values:
-            raise ArgumentError(None, "source is required")
+    Returns:
+        The integer.
 
-        setattr(namespace, self.dest, values)  # pyright: ignore
+    Raises:
+        ArgumentTypeError: if the value is not an integer greater than zero.
+    """
+    if not (value.isdecimal() and int(value) > 0):
+        raise ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return int(value)
 
 
-class _TupleAction(Action):
-    @override
-    def __call__(self, parser, namespace, values, option_string=None):
-        """Convert the list of values into a tuple and set it as an
-        attribute."""
-        values = values.split(",") if isinstance(values, str) else values
-        setattr(namespace, self.dest, tuple(values))  # pyright: ignore
+_OUTPUTS: tuple[str, ...] = tuple(x.value for x in Output)
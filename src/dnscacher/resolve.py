@@ -1,110 +1,205 @@
 import asyncio
 import logging
-import socket
-from asyncio import Semaphore
-from collections.abc import Coroutine
+import os
+import sys
+from asyncio import AbstractEventLoop
+from collections.abc import Callable, Iterable, Iterator
 
 from aiodns import DNSResolver
 from aiodns.error import DNSError
+from pycares import QUERY_TYPE_A
 from pygeneral.print.bar import ProgressBar
 
-from dnscacher.domains import Domains
+# Number of resolved domains that are stored and reported at once.
+_BATCH_SIZE: int = 1000
+
+# Size of the UDP receive buffer of the DNS socket. A large buffer keeps
+# responses from being dropped when many queries are in flight.
+_RECEIVE_BUFFER_SIZE: int = 4 << 20
+
+
+def loop_factory() -> Callable[[], AbstractEventLoop] | None:
+    """Return the factory for the event loop that resolves the domains.
+
+    By default, aiodns runs c-ares on the event thread of pycares, which
+    works with any event loop. If pycares cannot use that thread, aiodns falls
+    back to socket callbacks, which need a selector based event loop. That is
+    not the default on Windows, so it is used there. Elsewhere, the uvloop
+    event loop is used when it is installed, as it has less overhead per
+    callback than the default event loop.
+
+    Returns:
+        The event loop factory, or None to use the default event loop.
+
+    """
+    if os.name == "nt":
+        return asyncio.SelectorEventLoop
+
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
 
 
 class Resolver:
-    _excluded: set[str]
-    _semaphore: Semaphore
+    _debug: bool
+    _done: int
+    _excluded: frozenset[str]
+    _jobs: int
     _timeout: int
 
     def __init__(
         self,
         jobs: int = 10000,
         timeout: int = 5,
-        excluded: set[str] | None = None,
+        excluded: Iterable[str] | None = None,
     ):
         """Initialize.
 
         Args:
-            jobs (int, optional): Maximum number of concurrent resolutions.
+            jobs (int, optional): Number of workers that resolve the domains
+            concurrently.
             timeout (int, optional): Timeout for each resolution.
 
         """
         self._timeout = timeout
-        self._excluded = excluded or set()
-        self._semaphore = Semaphore(jobs)
+        self._excluded = frozenset(excluded or ())
+        self._jobs = jobs
+        self._debug = False
+        self._done = 0
 
     async def fetch_ips(
-        self, domains: Domains, mappings: dict[str, list[str]] | None = None
+        self,
+        domains: set[str],
+        mappings: dict[str, tuple[str, ...]] | None = None,
     ):
         """Resolve multiple domains concurrently.
 
+        A fixed pool of `jobs` workers takes the domains from a shared
+        iterator, so no task is created per domain. The DNS resolver is closed
+        when all domains are resolved, which releases its c-ares channel.
+
+        The progress bar is only drawn when stderr is a terminal, so nothing is
+        written to stderr for it when running from cron or a pipe.
+
         Args:
-            domains (Domains): Set of domains to resolve.
-            mappings (dict[str, list[str]], optional): object to update
+            domains (set[str]): Set of domains to resolve.
+            mappings (dict[str, tuple[str, ...]], optional): object to update
 
         """
-        dns = DNSResolver()
-        mappings = mappings or {}
-        tasks: list[Coroutine[None, None, tuple[str, list[str]]]] = [
-            self._fetch_ip(domain, dns) for domain in domains
-        ]
-        logging.info("Resolving %s domains async", len(tasks))
-
-        progress = ProgressBar(
-            max_value=len(tasks),
-            prefix="Resolving: ",
-            suffix=f" (0/{len(tasks)}) domains",
-        )
-
-        for i, future in enumerate(asyncio.as_completed(tasks)):
-            domain, ips = await future
-            mappings[domain] = self._filter_ips(ips)
-            progress.suffix = f" ({i+1}/{len(tasks)}) domains"
-            progress.value += 1
+        mappings = {} if mappings is None else mappings
+        total: int = len(domains)
+        logging.info("Resolving %s domains async", total)
+
+        # Checked once, as many domains of a blocklist fail to resolve.
+        self._debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        self._done = 0
+        progress: ProgressBar | None = None
+        if sys.stderr.isatty():
+            progress = ProgressBar(
+                max_value=total,
+                prefix="Resolving: ",
+                suffix=f" (0/{total}) domains",
+            )
+            progress.show()
+
+        pending: Iterator[str] = iter(domains)
+        batch: list[tuple[str, tuple[str, ...]]] = []
+
+        async def work(dns: DNSResolver):
+            for domain in pending:
+                batch.append(await self._fetch_ip(domain, dns))
+                if len(batch) == _BATCH_SIZE:
+                    self._flush(batch, mappings, progress, total)
+
+        async with DNSResolver(
+            timeout=self._timeout,
+            tries=1,
+            socket_receive_buffer_size=_RECEIVE_BUFFER_SIZE,
+        ) as dns:
+            jobs: int = min(self._jobs, total)
+            await asyncio.gather(*(work(dns) for _ in range(jobs)))
+        self._flush(batch, mappings, progress, total)
 
         logging.info("Resolved %s domains", len(mappings))
         return mappings
 
+    def _flush(
+        self,
+        batch: list[tuple[str, tuple[str, ...]]],
+        mappings: dict[str, tuple[str, ...]],
+        progress: ProgressBar | None,
+        total: int,
+    ):
+        """Store a batch of resolved domains and report the progress.
+
+        Args:
+            batch: The resolved domains and their filtered IPs. Is cleared
+            afterwards.
+            mappings: The object to store the batch in.
+            progress: The progress bar to advance, if any.
+            total: The total number of domains that are resolved.
+
+        """
+        mappings.update(batch)
+        self._done += len(batch)
+        logging.debug("Resolved %s/%s domains", self._done, total)
+        if progress is not None:
+            progress.suffix = f" ({self._done}/{total}) domains"
+            progress.value = self._done
+        batch.clear()
+
     async def _fetch_ip(
-        self, domain: str, dns_resolver: DNSResolver | None = None
-    ) -> tuple[str, list[str]]:
+        self, domain: str, dns_resolver: DNSResolver
+    ) -> tuple[str, tuple[str, ...]]:
         """Asynchronously resolve a single domain to its IPv4 addresses.
 
+        Only the A records are queried, so the answer is not converted into a
+        host result first. The timeout is enforced by c-ares, which raises a
+        DNSError when it expires.
+
+        The IPs are interned, as many domains resolve to the same IPs of a
+        CDN. The domains then share one string object per IP, which is also
+        pickled only once.
+
         Args:
             domain (str): The domain to resolve.
-            dns (DNSResolver, optional): DNSResolver instance. Defaults to None,
-            which creates a new instance.
+            dns_resolver (DNSResolver): The DNSResolver that is shared by all
+            workers.
 
         Returns:
-            A tuple containing the domain and a list of resolved IPs.
+            A tuple containing the domain and a tuple of resolved IPs.
 
         """
-        dns_resolver = dns_resolver or DNSResolver()
-        async with self._semaphore:
-            try:
-                result = await asyncio.wait_for(
-                    dns_resolver.gethostbyname(domain, socket.AF_INET),
-                    timeout=self._timeout,
-                )
-                ips = self._filter_ips(result.addresses)  # pyright: ignore
-                return domain, ips
-            except asyncio.TimeoutError:
-                logging.debug("Timeout resolving %s", domain)
-                return domain, []
-            except DNSError as e:
+        try:
+            result = await dns_resolver.query_dns(domain, "A")
+            ips: tuple[str, ...] = tuple(
+                sys.intern(record.data.addr)  # pyright: ignore
+                for record in result.answer
+                if record.type == QUERY_TYPE_A
+            )
+            return domain, self._filter_ips(ips)
+        except DNSError as e:
+            if self._debug:
                 logging.debug("Error resolving %s: %s", domain, e.args[1])
-                return domain, []
+            return domain, ()
 
-    def _filter_ips(self, ips: list[str]) -> list[str]:
+    def _filter_ips(self, ips: tuple[str, ...]) -> tuple[str, ...]:
         """Filter out excluded IPs.
 
+        Almost no domain resolves to an excluded IP, so the IPs are only
+        copied if they contain one.
+
         Args:
-            ips (list[str]): List of IPs to filter.
-            dns (DNSResolver, optional): DNSResolver instance. Defaults to None,
-            which creates a new instance.
+            ips (tuple[str, ...]): IPs to filter.
 
         Returns:
-            List of IPs excluding the excluded IPs.
+            Tuple of IPs excluding the excluded IPs.
 
         """
-        return [ip for ip in ips if ip not in self._excluded]
+        excluded: frozenset[str] = self._excluded
+        if excluded.isdisjoint(ips):
+            return ips
+        return tuple(ip for ip in ips if ip not in excluded)
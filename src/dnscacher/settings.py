@@ -1,18 +1,23 @@
 import logging
 import os
 from argparse import Namespace
-from dataclasses import dataclass
-from ntpath import expandvars
+from dataclasses import dataclass, fields
 from os import makedirs
-from os.path import dirname
-from typing import Self
+from os.path import dirname, expandvars
+from typing import ClassVar, Self
 
 from pygeneral.permission import is_root
 
-from dnscacher.exceptions import SettingsError
+_LOG_ROOT_UNIX: str = "/var/log/dnscacher.log"
+_LOG_UNIX: str = "$HOME/.local/state/dnscacher.log"
+_LOG_WIN: str = "$TEMP\\dnscacher\\dnscacher.log"
 
+_MAPPINGS_ROOT_UNIX: str = "/var/cache/dnscacher/mappings.pickle"
+_MAPPINGS_UNIX: str = "$HOME/.cache/dnscacher/mappings.pickle"
+_MAPPINGS_WIN: str = "$TEMP\\dnscacher\\mappings.pickle"
 
-@dataclass
+
+@dataclass(slots=True)
 class Settings:
     """Holds settings for the update-blocklist script.
 
@@ -29,8 +34,12 @@ class Settings:
         quiet (bool): Suppress output to stderr.
         timeout (int): Timeout in seconds for resolving a domain.
 
+        FIELDS (tuple[str, ...]): The names of the settings.
+
     """
 
+    FIELDS: ClassVar[tuple[str, ...]]
+
     command: str = ""
     debug: bool = False
     ipset: str = "dnscacher"
@@ -44,48 +53,16 @@ class Settings:
     timeout: int = 10
     quiet: bool = False
 
-    _log_root_unix: str = "/var/log/dnscacher.log"
-    _log_unix: str = "$HOME/.local/state/dnscacher.log"
-    _log_win: str = "$TEMP\\dnscacher\\dnscacher.log"
-
-    _mappings_root_unix: str = "/var/cache/dnscacher/mappings.pickle"
-    _mappings_unix: str = "$HOME/.cache/dnscacher/mappings.pickle"
-    _mappings_win: str = "$TEMP\\dnscacher\\mappings.pickle"
-
     def __post_init__(self):
-        """Set the default values for the settings."""
-        if is_root():
-            self._set_root_defaults()
-        else:
-            self._set_user_defaults()
-
-        self.mappings = expandvars(self.mappings)
-        self.log = expandvars(self.log)
-        logging.debug("Settings: %s", self)
+        """Set the default values for the settings.
 
-    def _set_root_defaults(self):
-        """Set the default values for root."""
-        if self.mappings:
-            return
-
-        if os.name == "nt":
-            self.mappings = self._mappings_win
-            self.log = self._log_win
-        else:
-            self.mappings = self._mappings_root_unix
-            self.log = self._log_root_unix
-
-    def _set_user_defaults(self):
-        """Set the default values for non-root users."""
-        if self.mappings:
-            return
-
-        if os.name == "nt":
-            self.mappings = self._mappings_win
-            self.log = self._log_win
-        else:
-            self.mappings = self._mappings_unix
-            self.log = self._log_unix
+        The mappings file and the log file fall back to their defaults
+        independently of each other.
+        """
+        mappings, log = _defaults(is_root(), os.name == "nt")
+        self.mappings = expandvars(self.mappings) if self.mappings else mappings
+        self.log = expandvars(self.log) if self.log else log
+        logging.debug("Settings: %s", self)
 
     def makedirs(self):
         """Create the directories needed for the settings.
@@ -98,23 +75,22 @@ class Settings:
             makedirs(d, exist_ok=True)
 
     def as_dict(self) -> dict[str, int | str | bool | tuple[str, ...]]:
-        """Return the public attributes of the Settings object that are not
-        functions or properties.
+        """Return the settings as a dictionary.
 
         Returns:
-            list[str]: The public attributes.
+            The names of the settings mapped to their values.
 
         """
-        return {
-            key: value
-            for key, value in self.__annotations__.items()
-            if not key.startswith("_")
-        }
+        return {key: getattr(self, key) for key in self.FIELDS}
 
     @classmethod
     def from_namespace(cls, namespace: Namespace) -> Self:
         """Create a Settings object from a namespace.
 
+        Only the fields of the Settings object are taken from the namespace.
+        Options that are not given are missing from the namespace or None and
+        keep their default value, while falsy values like `--part 0` are kept.
+
         Args:
             namespace: The namespace to create the object from.
 
@@ -122,8 +98,34 @@ class Settings:
             The Settings object.
 
         """
-        kwargs = {key: value for key, value in vars(namespace).items() if value}
-        try:
-            return cls(**kwargs)
-        except TypeError as e:
-            raise SettingsError(f"Invalid settings: {e}") from e
+        values: dict[str, object] = vars(namespace)
+        kwargs = {
+            key: values[key]
+            for key in cls.FIELDS
+            if values.get(key) is not None
+        }
+        return cls(**kwargs)  # pyright: ignore
+
+
+Settings.FIELDS = tuple(field.name for field in fields(Settings))
+
+
+def _defaults(root: bool, nt: bool) -> tuple[str, str]:
+    """Return the default paths of the mappings file and the log file.
+
+    Args:
+        root: whether the user is root.
+        nt: whether the operating system is Windows.
+
+    Returns:
+        The expanded paths of the mappings file and the log file. They are
+        expanded on every call, so changes to the environment are followed.
+
+    """
+    if nt:
+        mappings, log = _MAPPINGS_WIN, _LOG_WIN
+    elif root:
+        mappings, log = _MAPPINGS_ROOT_UNIX, _LOG_ROOT_UNIX
+    else:
+        mappings, log = _MAPPINGS_UNIX, _LOG_UNIX
+    return expandvars(mappings), expandvars(log)
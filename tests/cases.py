@@ -16,7 +16,7 @@ class ProjectTestCase(TestCase):
         self.mappings = Mappings(path=self.settings.mappings)
         self.mappings.update(
             {
-                "example.com": ["1.2.3.4"],
-                "example.org": ["5.6.7.8", "9.10.11.12"],
+                "example.com": ("1.2.3.4",),
+                "example.org": ("5.6.7.8", "9.10.11.12"),
             }
         )
@@ -1,10 +1,9 @@
 from tempfile import NamedTemporaryFile
 from unittest import TestCase
 
-import requests
-
 from dnscacher import paths
-from dnscacher.domains import Domains
+from dnscacher.domains import Domains, _decode
+from dnscacher.exceptions import SourceError
 
 
 class TestDomains(TestCase):
@@ -18,9 +17,21 @@ class TestDomains(TestCase):
 
     def test_invalid(self):
         """Test that update_from_url raises an error for an invalid URL."""
-        with self.assertRaises(requests.exceptions.ConnectionError):
+        with self.assertRaises(SourceError):
             Domains().update_from_source("https://notexisting_123abc.com")
 
+    def test_invalid_source(self):
+        """Test that a source that is neither a file nor an http(s) URL raises
+        an error without a request."""
+        with self.assertRaises(SourceError):
+            Domains().update_from_source("nonexistent.txt")
+
+    def test_decode(self):
+        """Test that characters split over chunks are decoded and that a
+        truncated character at the end is replaced."""
+        chunks = ["é".encode()[:1], "é".encode()[1:] + "é".encode()[:1]]
+        self.assertEqual("".join(_decode(chunks)), "é\ufffd")
+
     def test_not_domains_file(self):
         """Test that update_from_url returns an empty set when no valid domains
         are found."""
@@ -28,8 +39,36 @@ class TestDomains(TestCase):
             x = Domains().update_from_source(file.name)
             self.assertEqual(x, set())
 
+    def test_update_from_str(self):
+        """Test that comment lines are skipped and that domains are
+        lowercased."""
+        text = "\n".join(
+            [
+                "# comment.com",
+                "  # indented.comment.com",
+                "0.0.0.0 Example.COM www.example.org",
+                "1.2.3.4 example.net # inline.com",
+            ]
+        )
+        domains = Domains()
+        domains.update_from_str(text)
+        self.assertEqual(
+            domains,
+            {"example.com", "www.example.org", "example.net", "inline.com"},
+        )
+
+    def test_update_from_chunks(self):
+        """Test that lines that are split over chunks are parsed as a whole."""
+        chunks = ["0.0.0.0 exam", "ple.com\n# comm", "ent.com\nexample", ".org"]
+        domains = Domains().update_from_chunks(chunks)
+        self.assertEqual(domains, {"example.com", "example.org"})
+
     def test_operators(self):
-        """Test set operators on Domains."""
+        """Test set operators on Domains.
+
+        The operators are inherited from `set`, so their results are plain
+        sets.
+        """
         a = Domains({"a", "b", "c"})
         b = Domains({"b", "c", "d"})
         minus = a - b
@@ -41,7 +80,7 @@ class TestDomains(TestCase):
         self.assertEqual(bar, {"a", "b", "c", "d"})
 
         for x in [minus, amp, bar]:
-            self.assertIsInstance(x, Domains)
+            self.assertIs(type(x), set)
 
     def test_empty(self):
         """Test that an empty Domains set returns an empty subset."""
@@ -1,4 +1,4 @@
-import re
+import io
 import textwrap
 
 from dnscacher import formatter
@@ -9,13 +9,23 @@ from tests.cases import ProjectTestCase
 class TestFormatter(ProjectTestCase):
     """Test cases for the formatter module."""
 
-    def test_product(self):
-        """Test that the product function returns the expected output.
+    def test_write(self):
+        """Test that write writes the formatted objects, each followed by a
+        newline character, and skips the objects that format to an empty
+        string.
 
-        The order of the output is not guaranteed but the sections are, i.e.,
-        ips, domains, and mappings, respectively.
+        The order of the lines within a section is not guaranteed but the
+        sections are, i.e., ips, domains, and mappings, respectively.
         """
         outputs: tuple[str, ...] = tuple(x.value for x in Output)
+        objects: list[object] = [
+            self.mappings,
+            self.mappings.ips,
+            self.mappings.domains,
+        ]
+        file = io.StringIO()
+        formatter.write(objects, outputs, file)
+
         expected: str = textwrap.dedent(
             """
             1.2.3.4
@@ -26,20 +36,13 @@ class TestFormatter(ProjectTestCase):
             example.com 1.2.3.4
             example.org 5.6.7.8 9.10.11.12
             """
-        ).strip()
-        actual: str = formatter.product(
-            [self.mappings, self.mappings.ips, self.mappings.domains], outputs
-        )
-
+        ).lstrip()
+        actual: str = file.getvalue()
         actual_lines = actual.splitlines()
         expected_lines = expected.splitlines()
 
-        assert sorted(actual_lines) == sorted(expected_lines)
-
-        # first 3 lines are ips
-        for line in actual_lines[:3]:
-            assert re.match(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}", line)
-
-        # next 2 lines are domains
-        for line in actual_lines[3:5]:
-            assert re.match(r"\w+\.\w+", line)
+        assert actual.endswith("\n")
+        assert "\n\n" not in actual
+        assert sorted(actual_lines[:3]) == sorted(expected_lines[:3])
+        assert sorted(actual_lines[3:5]) == sorted(expected_lines[3:5])
+        assert actual_lines[5:] == expected_lines[5:]
@@ -21,3 +21,22 @@ class TestIpSet(ProjectTestCase):
         expected_lines = expected.splitlines()
 
         assert sorted(actual_lines) == sorted(expected_lines)
+
+    def test_format_restore(self):
+        ipset = IpSet("dnscacher")
+        ipset.update(self.mappings.ips)
+        actual = format(ipset, Output.IPSET_RESTORE.value).splitlines()
+        assert actual[:2] == [
+            "create dnscacher hash:ip -exist",
+            "flush dnscacher",
+        ]
+        assert sorted(actual[2:]) == sorted(
+            f"add dnscacher {ip}" for ip in self.mappings.ips
+        )
+
+    def test_format_empty(self):
+        ipset = IpSet("dnscacher")
+        assert format(ipset, Output.IPSET.value) == ""
+        actual = format(ipset, Output.IPSET_RESTORE.value)
+        expected = "create dnscacher hash:ip -exist\nflush dnscacher"
+        assert actual == expected
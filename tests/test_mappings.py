@@ -1,9 +1,13 @@
 import pickle
 from contextlib import suppress
-from os import remove
+from os import listdir, remove, stat, umask
+from os.path import join
+from stat import S_IMODE
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 from dnscacher.domains import Domains
+from dnscacher.ips import Ips
 from dnscacher.mappings import InvalidCacheError, Mappings
 from dnscacher.settings import Settings
 
@@ -20,8 +24,8 @@ class TestMappings(TestCase):
         self.mappings = Mappings(path=self.settings.mappings)
         self.mappings.update(
             {
-                "example.com": ["1.2.3.4"],
-                "example.org": ["5.6.7.8", "9.10.11.12"],
+                "example.com": ("1.2.3.4",),
+                "example.org": ("5.6.7.8", "9.10.11.12"),
             }
         )
 
@@ -38,6 +42,37 @@ class TestMappings(TestCase):
         self.assertIsInstance(result, dict)
         self.assertEqual(result, self.mappings)
 
+    def test_pickled_as_dict(self):
+        """Test that the mappings are pickled as a plain dict."""
+        self.mappings.save()
+        with open(self.settings.mappings, "rb") as f:
+            result = pickle.load(f)
+        self.assertIs(type(result), dict)
+        self.assertEqual(result, self.mappings)
+
+    def test_save_mode(self):
+        """Test that the saved mappings file gets its mode from the umask."""
+        for mask, mode in ((0o022, 0o644), (0o077, 0o600)):
+            with self.subTest(mask=oct(mask)):
+                old: int = umask(mask)
+                try:
+                    self.mappings.save()
+                finally:
+                    umask(old)
+                self.assertEqual(
+                    S_IMODE(stat(self.settings.mappings).st_mode), mode
+                )
+
+    def test_save_error(self):
+        """Test that a failed save raises InvalidCacheError and leaves no
+        temporary file behind."""
+        with TemporaryDirectory() as directory:
+            mappings = Mappings(join(directory, "mappings"))
+            mappings["example.com"] = (lambda: None,)  # pyright: ignore
+            with self.assertRaises(InvalidCacheError):
+                mappings.save()
+            self.assertEqual(listdir(directory), [])
+
     def test_empty(self):
         """Test loading when mappings file is empty or missing."""
         result = Mappings("/tmp/nonexistent_mappings")
@@ -54,6 +89,19 @@ class TestMappings(TestCase):
         with self.assertRaises(InvalidCacheError):
             result.load()
 
+    def test_ips(self):
+        """Test that ips contains the IPs of all domains."""
+        result = self.mappings.ips
+        self.assertIsInstance(result, Ips)
+        self.assertEqual(result, {"1.2.3.4", "5.6.7.8", "9.10.11.12"})
+
+    def test_remove_many(self):
+        """Test that remove_many removes the given domains only."""
+        self.mappings.remove_many(["example.com"])
+        self.assertEqual(
+            self.mappings, {"example.org": ("5.6.7.8", "9.10.11.12")}
+        )
+
     def test_update_by_resolving(self):
         """Test that update_by_resolving correctly adds new mappings."""
         domains = Domains({"example.net", "example.nl"})
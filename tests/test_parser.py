@@ -1,26 +1,48 @@
 import sys
 from os.path import join
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from dnscacher import paths
 from dnscacher.parser import Parser
 from dnscacher.settings import Settings
 
+_OPTIONS: tuple[str, ...] = (
+    "--jobs=10",
+    "--loglevel=INFO",
+    "--mappings=/tmp/mappings.txt",
+    "--ipset=foo",
+    "--log=/tmp/dnscacher.log",
+    "--timeout=5",
+    "--output=ips,mappings",
+    "--quiet",
+    "--debug",
+)
+
+_EXPECTED: Settings = Settings(
+    jobs=10,
+    command="update",
+    loglevel="INFO",
+    mappings="/tmp/mappings.txt",
+    ipset="foo",
+    log="/tmp/dnscacher.log",
+    part=50,
+    timeout=5,
+    output=("ips", "mappings"),
+    debug=True,
+    quiet=True,
+    source=join(paths.root, "debug.txt"),
+)
+
 
 class TestParser(TestCase):
     """Test cases for the Parser class."""
 
     parser: Parser
-    _argv: list[str]
-
-    def setUp(self):
-        """Set up test environment for Parser tests."""
-        self.parser = Parser()
-        self._argv = sys.argv.copy()
 
-    def tearDown(self):
-        """Restore sys.argv after tests."""
-        sys.argv = self._argv
+    @classmethod
+    def setUpClass(cls):
+        """Build the parser once, as parsing does not change it."""
+        cls.parser = Parser()
 
     def test_parse(self):
         """Test that the parser correctly parses given command-line
@@ -29,49 +51,39 @@ class TestParser(TestCase):
         Adding options before or after the command should not affect the
         result.
         """
-        options: list[str] = [
-            "--jobs=10",
-            "--loglevel=INFO",
-            "--mappings=/tmp/mappings.txt",
-            "--ipset=foo",
-            "--log=/tmp/dnscacher.log",
-            "--timeout=5",
-            "--output=ips,mappings",
-            "--quiet",
-            "--debug",
+        cases: list[list[str]] = [
+            ["dnscacher", "update", *_OPTIONS],
+            ["dnscacher", *_OPTIONS, "update"],
         ]
+        for argv in cases:
+            with self.subTest(argv=argv), mock.patch.object(sys, "argv", argv):
+                settings = self.parser.parse_args()
+                settings.part = 50  # can only be added to refresh command
+                self.assertEqual(_EXPECTED.as_dict(), settings.as_dict())
 
-        sys.argv = ["dnscacher"]
-        sys.argv.append("update")
-        sys.argv.extend(options)
-        self._parse_assert()
+    def test_invalid_output(self):
+        """Test that an invalid output is rejected while parsing."""
+        argv: list[str] = ["dnscacher", "--output=ips,invalid", "get"]
+        with mock.patch.object(sys, "argv", argv):
+            with self.assertRaises(SystemExit):
+                self.parser.parse_args()
 
-        sys.argv = ["dnscacher"]
-        sys.argv.extend(options)
-        sys.argv.append("update")
-        self._parse_assert()
+    def test_not_positive(self):
+        """Test that --jobs and --timeout must be positive integers."""
+        for option in ("--jobs=0", "--timeout=0", "--jobs=-1", "--timeout=x"):
+            argv = ["dnscacher", option, "get"]
+            with self.subTest(option=option):
+                with mock.patch.object(sys, "argv", argv):
+                    with self.assertRaises(SystemExit):
+                        self.parser.parse_args()
 
-    def _parse_assert(self):
-        settings = self.parser.parse_args()
-        settings.part = 50  # can only be added to refresh command
+    def test_missing_source(self):
+        """Test that the add and update commands require a source, unless
+        the `--debug` option is set."""
+        with mock.patch.object(sys, "argv", ["dnscacher", "update"]):
+            with self.assertRaises(SystemExit):
+                self.parser.parse_args()
 
-        expected = Settings(
-            jobs=10,
-            command="update",
-            loglevel="INFO",
-            mappings="/tmp/mappings.txt",
-            ipset="foo",
-            log="/tmp/dnscacher.log",
-            part=50,
-            timeout=5,
-            output=("ips", "mappings"),
-            debug=True,
-            quiet=True,
-            source=join(paths.root, "debug.txt"),
-        )
-        for key in expected.as_dict():
-            self.assertEqual(
-                getattr(expected, key),
-                getattr(settings, key),
-                msg=f"Failed on key: {key}",
-            )
+        argv = ["dnscacher", "--quiet", "add", "domains.txt", "--jobs=1"]
+        with mock.patch.object(sys, "argv", argv):
+            self.assertEqual(self.parser.parse_args().source, "domains.txt")
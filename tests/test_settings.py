@@ -1,5 +1,8 @@
-from os.path import dirname
-from unittest import TestCase
+from argparse import Namespace
+from os.path import dirname, isdir, join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+from uuid import uuid4
 
 from dnscacher.settings import Settings
 
@@ -7,14 +10,68 @@ from dnscacher.settings import Settings
 class TestSettings(TestCase):
     """Test cases for the Settings class."""
 
+    _tmpdir: TemporaryDirectory
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory for all tests."""
+        cls._tmpdir = TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory."""
+        cls._tmpdir.cleanup()
+
     def test_makedirs(self):
-        """Test that makedirs creates the required directory for mappings."""
-        import os
-        from tempfile import TemporaryDirectory
-
-        with TemporaryDirectory() as tmpdirname:
-            settings = Settings(
-                debug=True, mappings=f"{tmpdirname}/subdir/mappings_file"
-            )
-            settings.makedirs()
-            self.assertTrue(os.path.isdir(dirname(settings.mappings)))
+        """Test that makedirs creates the required directory for mappings,
+        also when it is nested or already exists."""
+        subdir: str = join(self._tmpdir.name, f"sub_{uuid4().hex}")
+        cases: tuple[str, ...] = (
+            join(subdir, "mappings_file"),
+            join(subdir, "nested", "deeper", "mappings_file"),
+            join(subdir, "mappings_file"),
+        )
+        for mappings in cases:
+            with self.subTest(mappings=mappings):
+                settings = Settings(debug=True, mappings=mappings)
+                settings.makedirs()
+                self.assertTrue(isdir(dirname(settings.mappings)))
+
+    def test_defaults(self):
+        """Test that the mappings file and the log file fall back to their
+        defaults independently of each other."""
+        default = Settings()
+        settings = Settings(mappings="/tmp/mappings")
+        self.assertEqual(settings.log, default.log)
+        settings = Settings(log="/tmp/dnscacher.log")
+        self.assertEqual(settings.mappings, default.mappings)
+        self.assertEqual(settings.log, "/tmp/dnscacher.log")
+
+    def test_defaults_environment(self):
+        """Test that the default paths follow changes to the environment."""
+        for home in ("/tmp/home1", "/tmp/home2"):
+            environ = {"HOME": home, "TEMP": home}
+            with (
+                self.subTest(home=home),
+                mock.patch("dnscacher.settings.is_root", return_value=False),
+                mock.patch.dict("os.environ", environ),
+            ):
+                self.assertTrue(Settings().mappings.startswith(home))
+
+    def test_from_namespace(self):
+        """Test that from_namespace keeps falsy values and skips options that
+        are None or not a setting."""
+        namespace = Namespace(part=0, jobs=None, command="refresh", other=1)
+        settings = Settings.from_namespace(namespace)
+        self.assertEqual(settings.part, 0)
+        self.assertEqual(settings.jobs, Settings().jobs)
+        self.assertEqual(settings.command, "refresh")
+
+    def test_as_dict(self):
+        """Test that as_dict maps the names of the settings to their
+        values."""
+        settings = Settings(jobs=1, output=("ips",))
+        result = settings.as_dict()
+        self.assertEqual(tuple(result), Settings.FIELDS)
+        self.assertEqual(result["jobs"], 1)
+        self.assertEqual(result["output"], ("ips",))